@@ -1,15 +1,19 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from bson import ObjectId
 import os
+import time
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
-import uuid
+from pydantic import AliasChoices, BaseModel, BeforeValidator, Field, field_validator
+from typing import Annotated, Dict, List, Optional
 from datetime import datetime, date
-from decimal import Decimal
 
 
 ROOT_DIR = Path(__file__).parent
@@ -17,19 +21,28 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=50,
+    minPoolSize=10,  # keep warm connections so the first requests skip the handshake
+    serverSelectionTimeoutMS=2000,
+    compressors="zstd"
+)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
 
+# Documents are keyed by their ObjectId _id, which the API exposes as a string "id"
+PyObjectId = Annotated[str, BeforeValidator(str)]
+
 # Define Models
 class SalesTransaction(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: PyObjectId = Field(validation_alias=AliasChoices("_id", "id"))
     item_name: str
     purchase_cost: float
     retail_price: float
@@ -40,6 +53,18 @@ class SalesTransaction(BaseModel):
     date_sold: date = Field(default_factory=date.today)
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # date_sold is stored as a BSON Date, which Motor returns as a datetime
+    @field_validator('date_sold', mode='before')
+    @classmethod
+    def date_sold_from_datetime(cls, value):
+        if isinstance(value, datetime):
+            return value.date()
+        return value
+
+class TransactionPage(BaseModel):
+    items: List[SalesTransaction]
+    next_cursor: Optional[str] = None
+
 class SalesTransactionCreate(BaseModel):
     item_name: str
     purchase_cost: float
@@ -55,7 +80,7 @@ class SalesTransactionUpdate(BaseModel):
     date_sold: Optional[date] = None
 
 class InventoryItem(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: PyObjectId = Field(validation_alias=AliasChoices("_id", "id"))
     item_name: str
     purchase_cost: float
     suggested_retail_price: float
@@ -84,6 +109,9 @@ class InventoryItemUpdate(BaseModel):
     supplier: Optional[str] = None
     category: Optional[str] = None
 
+class BulkDeleteRequest(BaseModel):
+    ids: List[str]
+
 class DashboardStats(BaseModel):
     total_revenue: float
     total_profit: float
@@ -104,36 +132,230 @@ class SalesChart(BaseModel):
     revenue_data: List[float]
     profit_data: List[float]
 
-# Helper function to calculate transaction metrics
-def calculate_transaction_metrics(transaction_data):
-    purchase_cost = transaction_data['purchase_cost']
-    retail_price = transaction_data['retail_price']
-    quantity = transaction_data['quantity']
-    
-    profit_per_item = retail_price - purchase_cost
-    total_profit = profit_per_item * quantity
-    total_revenue = retail_price * quantity
-    profit_margin = (profit_per_item / retail_price * 100) if retail_price > 0 else 0
-    
-    return {
-        'profit': total_profit,
-        'revenue': total_revenue,
-        'profit_margin': profit_margin
-    }
+# Update-pipeline stage computing transaction metrics server-side from the stored fields
+TRANSACTION_METRICS_STAGE = {"$set": {
+    "profit": {"$multiply": [{"$subtract": ["$retail_price", "$purchase_cost"]}, "$quantity"]},
+    "revenue": {"$multiply": ["$retail_price", "$quantity"]},
+    "profit_margin": {"$cond": [
+        {"$gt": ["$retail_price", 0]},
+        {"$multiply": [{"$divide": [{"$subtract": ["$retail_price", "$purchase_cost"]}, "$retail_price"]}, 100]},
+        0
+    ]}
+}}
+
+# Helper function to build the update pipeline that sets fields and recomputes metrics.
+# Values are wrapped in $literal so strings starting with "$" aren't read as field paths.
+def set_with_metrics_pipeline(fields):
+    return [
+        {"$set": {key: {"$literal": value} for key, value in fields.items()}},
+        TRANSACTION_METRICS_STAGE
+    ]
+
+# Update-pipeline stage copying the fields the rollups depend on into _previous, so a
+# single find_one_and_update returning AFTER still yields the pre-update totals
+ROLLUP_FIELDS = ("revenue", "profit", "profit_margin", "date_sold", "item_name", "quantity")
+STASH_PREVIOUS_STAGE = {"$set": {"_previous": {field: f"${field}" for field in ROLLUP_FIELDS}}}
+
+# Projection for every raw transaction read, so the internal stash never leaves the
+# server; PUT is the one read that needs _previous, and it pops it before responding
+TRANSACTION_PROJECTION = {"_previous": 0}
+
+# Helper function to build the update pipeline that decrements stock, never going below zero
+def stock_decrement_pipeline(quantity_sold: int, updated_at: datetime):
+    return [{"$set": {
+        "quantity_in_stock": {"$max": [{"$subtract": ["$quantity_in_stock", quantity_sold]}, 0]},
+        "updated_at": updated_at
+    }}]
 
 # Helper function to update inventory when sale is made
 async def update_inventory_on_sale(item_name: str, quantity_sold: int):
-    # Find inventory item by name
-    inventory_item = await db.inventory.find_one({"item_name": item_name})
-    if inventory_item:
-        new_quantity = inventory_item['quantity_in_stock'] - quantity_sold
-        if new_quantity < 0:
-            new_quantity = 0
-        
-        await db.inventory.update_one(
-            {"item_name": item_name},
-            {"$set": {"quantity_in_stock": new_quantity, "updated_at": datetime.utcnow()}}
+    # Decrement stock atomically in one round trip
+    await db.inventory.update_one(
+        {"item_name": item_name},
+        stock_decrement_pipeline(quantity_sold, datetime.utcnow())
+    )
+
+# Helper function to update inventory for many sales in a single round trip
+async def update_inventory_bulk(decrements: Dict[str, int]):
+    if not decrements:
+        return
+    now = datetime.utcnow()
+    ops = [
+        UpdateOne({"item_name": item_name}, stock_decrement_pipeline(quantity_sold, now))
+        for item_name, quantity_sold in decrements.items()
+    ]
+    await db.inventory.bulk_write(ops, ordered=False)
+
+# Helper function to build the stored fields of a new transaction from user input
+def new_transaction_fields(input: SalesTransactionCreate):
+    transaction_dict = input.dict()
+    
+    # Set default date if not provided (BSON has no date-only type)
+    sold_on = transaction_dict.get('date_sold') or date.today()
+    transaction_dict['date_sold'] = datetime.combine(sold_on, datetime.min.time())
+    transaction_dict['created_at'] = datetime.utcnow()
+    
+    return transaction_dict
+
+# Helper function to parse a path id, treating malformed ids as not found
+def parse_object_id(value: str, detail: str):
+    if not ObjectId.is_valid(value):
+        raise HTTPException(status_code=404, detail=detail)
+    return ObjectId(value)
+
+# Helper function to expose a stored document's _id as its string "id"
+def with_string_id(document):
+    document['id'] = str(document.pop('_id'))
+    return document
+
+# Helper function to shape a stored transaction for output without re-validating it
+def transaction_to_response(transaction):
+    transaction['date_sold'] = transaction['date_sold'].date()
+    return with_string_id(transaction)
+
+# Per-day totals are kept in the daily_rollup collection, keyed by YYYY-MM-DD and
+# adjusted on every transaction write instead of being recomputed per request
+DAILY_ROLLUP_GROUP_STAGE = {"$group": {
+    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date_sold"}},
+    "revenue": {"$sum": "$revenue"},
+    "profit": {"$sum": "$profit"},
+    "transactions": {"$sum": 1}
+}}
+
+# Helper function to build rollup increments for transactions (sign=-1 removes them)
+def daily_rollup_ops(transactions, sign: int):
+    return [
+        UpdateOne(
+            {"_id": transaction['date_sold'].strftime('%Y-%m-%d')},
+            {"$inc": {
+                "revenue": sign * transaction['revenue'],
+                "profit": sign * transaction['profit'],
+                "transactions": sign
+            }},
+            upsert=True
         )
+        for transaction in transactions
+    ]
+
+# Units sold per item are kept in item_totals (keyed by item_name) the same way,
+# so the best seller is a single indexed lookup
+ITEM_TOTALS_GROUP_STAGE = {"$group": {"_id": "$item_name", "qty": {"$sum": "$quantity"}}}
+
+# Helper function to build item quantity increments for transactions (sign=-1 removes them)
+def item_totals_ops(transactions, sign: int):
+    return [
+        UpdateOne({"_id": transaction['item_name']}, {"$inc": {"qty": sign * transaction['quantity']}}, upsert=True)
+        for transaction in transactions
+    ]
+
+# Overall totals are kept in a single sales_totals document, so the dashboard reads
+# them by _id. Only positive margins are summed and counted towards the average.
+SALES_TOTALS_ID = "all"
+SALES_TOTALS_GROUP_STAGE = {"$group": {
+    "_id": SALES_TOTALS_ID,
+    "revenue": {"$sum": "$revenue"},
+    "profit": {"$sum": "$profit"},
+    "transactions": {"$sum": 1},
+    "margin_sum": {"$sum": {"$cond": [{"$gt": ["$profit_margin", 0]}, "$profit_margin", 0]}},
+    "margin_count": {"$sum": {"$cond": [{"$gt": ["$profit_margin", 0]}, 1, 0]}}
+}}
+
+# Helper function to build overall totals increments for transactions (sign=-1 removes them)
+def sales_totals_ops(transactions, sign: int):
+    return [
+        UpdateOne(
+            {"_id": SALES_TOTALS_ID},
+            {"$inc": {
+                "revenue": sign * transaction['revenue'],
+                "profit": sign * transaction['profit'],
+                "transactions": sign,
+                "margin_sum": sign * transaction['profit_margin'] if transaction['profit_margin'] > 0 else 0,
+                "margin_count": sign if transaction['profit_margin'] > 0 else 0
+            }},
+            upsert=True
+        )
+        for transaction in transactions
+    ]
+
+# Helper function to apply added/removed transactions to all rollups concurrently
+async def update_rollups(added=(), removed=()):
+    added, removed = list(added), list(removed)
+    daily_ops = daily_rollup_ops(added, 1) + daily_rollup_ops(removed, -1)
+    item_ops = item_totals_ops(added, 1) + item_totals_ops(removed, -1)
+    totals_ops = sales_totals_ops(added, 1) + sales_totals_ops(removed, -1)
+    if daily_ops:
+        await asyncio.gather(
+            db.daily_rollup.bulk_write(daily_ops, ordered=False),
+            db.item_totals.bulk_write(item_ops, ordered=False),
+            db.sales_totals.bulk_write(totals_ops, ordered=False)
+        )
+
+# A rebuild replaces the rollups with $out, so an increment landing between its $group
+# read and the swap would be lost or counted twice. Transaction writes therefore hold
+# rollup_write() around the write and its increments, and rollup_rebuild() waits for
+# them to drain and holds new ones back until the swap is done. This only covers the
+# current process; other workers are not blocked.
+_rollup_state = {"writers": 0, "rebuilding": False}
+_rollup_condition = asyncio.Condition()
+
+@asynccontextmanager
+async def rollup_write():
+    async with _rollup_condition:
+        await _rollup_condition.wait_for(lambda: not _rollup_state["rebuilding"])
+        _rollup_state["writers"] += 1
+    try:
+        yield
+    finally:
+        async with _rollup_condition:
+            _rollup_state["writers"] -= 1
+            _rollup_condition.notify_all()
+
+@asynccontextmanager
+async def rollup_rebuild():
+    async with _rollup_condition:
+        await _rollup_condition.wait_for(lambda: not _rollup_state["rebuilding"])
+        _rollup_state["rebuilding"] = True
+        await _rollup_condition.wait_for(lambda: _rollup_state["writers"] == 0)
+    try:
+        yield
+    finally:
+        async with _rollup_condition:
+            _rollup_state["rebuilding"] = False
+            _rollup_condition.notify_all()
+
+# Helper function to recompute all rollups from the transactions collection
+# (callers hold rollup_rebuild())
+async def rebuild_rollups():
+    await asyncio.gather(
+        db.transactions.aggregate([DAILY_ROLLUP_GROUP_STAGE, {"$out": "daily_rollup"}]).to_list(None),
+        db.transactions.aggregate([ITEM_TOTALS_GROUP_STAGE, {"$out": "item_totals"}]).to_list(None),
+        db.transactions.aggregate([SALES_TOTALS_GROUP_STAGE, {"$out": "sales_totals"}]).to_list(None)
+    )
+
+# Per-day totals are shared by /dashboard and /sales-chart, so cache them briefly
+DAILY_CACHE_TTL = 5  # seconds
+_daily_cache = {"rows": None, "expires": 0.0, "generation": 0}
+_daily_lock = asyncio.Lock()
+
+# Writes bump the generation, so a refresh that was already reading when a write
+# finished returns its rows without caching them
+def _invalidate_daily_cache():
+    _daily_cache["generation"] += 1
+    _daily_cache["rows"] = None
+
+# Helper function to read revenue/profit per sale date (sorted by date)
+async def _aggregate_daily():
+    async with _daily_lock:
+        if _daily_cache["rows"] is not None and time.monotonic() < _daily_cache["expires"]:
+            return _daily_cache["rows"]
+        generation = _daily_cache["generation"]
+        # Days whose transactions were all deleted stay behind with a zero count
+        cursor = db.daily_rollup.find({"transactions": {"$gt": 0}}).sort("_id", 1)
+        rows = await cursor.to_list(None)
+        if generation == _daily_cache["generation"]:
+            _daily_cache["rows"] = rows
+            _daily_cache["expires"] = time.monotonic() + DAILY_CACHE_TTL
+        return rows
 
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
@@ -143,126 +365,181 @@ async def root():
 # Sales Transaction Endpoints
 @api_router.post("/transactions", response_model=SalesTransaction)
 async def create_transaction(input: SalesTransactionCreate):
-    transaction_dict = input.dict()
-    
-    # Set default date if not provided
-    if not transaction_dict.get('date_sold'):
-        transaction_dict['date_sold'] = date.today()
-    
-    # Calculate metrics
-    metrics = calculate_transaction_metrics(transaction_dict)
-    transaction_dict.update(metrics)
-    
-    # Create transaction object
-    transaction_obj = SalesTransaction(**transaction_dict)
-    
-    # Convert to dict for MongoDB (handle date serialization)
-    transaction_for_db = transaction_obj.dict()
-    transaction_for_db['date_sold'] = transaction_for_db['date_sold'].isoformat()
-    
-    # Insert into database
-    result = await db.transactions.insert_one(transaction_for_db)
-    
-    # Update inventory
-    await update_inventory_on_sale(transaction_obj.item_name, transaction_obj.quantity)
+    transaction_dict = new_transaction_fields(input)
+    
+    # Insert via upsert so MongoDB computes the metrics, and update inventory concurrently
+    async with rollup_write():
+        transaction, _ = await asyncio.gather(
+            db.transactions.find_one_and_update(
+                {"_id": ObjectId()},
+                set_with_metrics_pipeline(transaction_dict),
+                projection=TRANSACTION_PROJECTION,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            ),
+            update_inventory_on_sale(transaction_dict['item_name'], transaction_dict['quantity'])
+        )
+        await update_rollups(added=[transaction])
+    _invalidate_daily_cache()
     
-    return transaction_obj
+    return SalesTransaction(**transaction)
 
-@api_router.get("/transactions", response_model=List[SalesTransaction])
-async def get_transactions():
-    transactions = await db.transactions.find().sort("created_at", -1).to_list(1000)
+@api_router.post("/transactions/bulk", response_model=List[SalesTransaction])
+async def create_transactions_bulk(inputs: List[SalesTransactionCreate]):
+    if not inputs:
+        return []
+    
+    transaction_dicts = [new_transaction_fields(input) for input in inputs]
+    transaction_ids = [ObjectId() for _ in transaction_dicts]
     
-    # Convert date strings back to date objects
-    for transaction in transactions:
-        if isinstance(transaction['date_sold'], str):
-            transaction['date_sold'] = datetime.fromisoformat(transaction['date_sold']).date()
+    # Sum quantities per item so each inventory row gets a single decrement
+    decrements = {}
+    for transaction_dict in transaction_dicts:
+        decrements[transaction_dict['item_name']] = decrements.get(transaction_dict['item_name'], 0) + transaction_dict['quantity']
     
-    return [SalesTransaction(**transaction) for transaction in transactions]
+    # Insert all transactions and update inventory concurrently
+    ops = [
+        UpdateOne({"_id": transaction_id}, set_with_metrics_pipeline(transaction_dict), upsert=True)
+        for transaction_id, transaction_dict in zip(transaction_ids, transaction_dicts)
+    ]
+    async with rollup_write():
+        await asyncio.gather(
+            db.transactions.bulk_write(ops, ordered=False),
+            update_inventory_bulk(decrements)
+        )
+        
+        # Read back the server-computed metrics in one query
+        stored = {
+            transaction['_id']: transaction
+            async for transaction in db.transactions.find({"_id": {"$in": transaction_ids}}, TRANSACTION_PROJECTION)
+        }
+        await update_rollups(added=stored.values())
+    _invalidate_daily_cache()
+    return [SalesTransaction(**stored[transaction_id]) for transaction_id in transaction_ids]
+
+@api_router.post("/transactions/recompute")
+async def recompute_transaction_metrics():
+    # Maintenance operation: backfill metrics across the whole collection in a single
+    # server-side pass and rebuild the rollups. Transaction writes in this worker wait
+    # until it finishes; with several workers, run it while the others take no writes,
+    # since their increments can still race the $out swap
+    async with rollup_rebuild():
+        result = await db.transactions.update_many({}, [TRANSACTION_METRICS_STAGE])
+        await rebuild_rollups()
+    _invalidate_daily_cache()
+    return {"message": "Transaction metrics recomputed", "modified_count": result.modified_count}
+
+@api_router.get("/transactions", response_model=TransactionPage)
+async def get_transactions(limit: int = Query(50, ge=1, le=1000), cursor: Optional[str] = None):
+    # Keyset pagination on _id (newest first) avoids the O(skip) cost of .skip()
+    query = {}
+    if cursor:
+        if not ObjectId.is_valid(cursor):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = {"_id": {"$lt": ObjectId(cursor)}}
+    
+    transactions = await db.transactions.find(query, TRANSACTION_PROJECTION).sort("_id", -1).limit(limit).to_list(limit)
+    
+    # A short page means there is nothing left to fetch
+    next_cursor = str(transactions[-1]['_id']) if len(transactions) == limit else None
+    
+    # Stored documents are trusted, so skip model validation and serialize them directly
+    return ORJSONResponse({
+        "items": [transaction_to_response(transaction) for transaction in transactions],
+        "next_cursor": next_cursor
+    })
 
 @api_router.get("/transactions/{transaction_id}", response_model=SalesTransaction)
 async def get_transaction(transaction_id: str):
-    transaction = await db.transactions.find_one({"id": transaction_id})
+    object_id = parse_object_id(transaction_id, "Transaction not found")
+    transaction = await db.transactions.find_one({"_id": object_id}, TRANSACTION_PROJECTION)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transaction not found")
     
-    # Convert date string back to date object
-    if isinstance(transaction['date_sold'], str):
-        transaction['date_sold'] = datetime.fromisoformat(transaction['date_sold']).date()
-    
     return SalesTransaction(**transaction)
 
 @api_router.put("/transactions/{transaction_id}", response_model=SalesTransaction)
 async def update_transaction(transaction_id: str, input: SalesTransactionUpdate):
-    # Get existing transaction
-    existing_transaction = await db.transactions.find_one({"id": transaction_id})
-    if not existing_transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-    
-    # Convert existing transaction date back to date object if it's a string
-    if isinstance(existing_transaction['date_sold'], str):
-        existing_transaction['date_sold'] = datetime.fromisoformat(existing_transaction['date_sold']).date()
-    
-    # Update only provided fields
-    update_data = input.dict(exclude_unset=True)
-    
-    # Merge with existing data
-    transaction_dict = {**existing_transaction, **update_data}
-    
-    # Recalculate metrics with updated data
-    metrics = calculate_transaction_metrics(transaction_dict)
-    transaction_dict.update(metrics)
-    
-    # Update the updated timestamp
-    transaction_dict['created_at'] = datetime.utcnow()
-    
-    # Create updated transaction object
-    updated_transaction = SalesTransaction(**transaction_dict)
-    
-    # Convert to dict for MongoDB (handle date serialization)
-    transaction_for_db = updated_transaction.dict()
-    transaction_for_db['date_sold'] = transaction_for_db['date_sold'].isoformat()
-    
-    # Update in database
-    await db.transactions.update_one(
-        {"id": transaction_id}, 
-        {"$set": transaction_for_db}
-    )
+    object_id = parse_object_id(transaction_id, "Transaction not found")
+    
+    # Update only provided fields (every stored transaction field is required)
+    update_data = {k: v for k, v in input.dict(exclude_unset=True).items() if v is not None}
+    if 'date_sold' in update_data:
+        update_data['date_sold'] = datetime.combine(update_data['date_sold'], datetime.min.time())
+    update_data['created_at'] = datetime.utcnow()
+    
+    # Apply the update and recalculate metrics atomically; both versions come from
+    # the same write, so concurrent updates can't skew the rollup delta
+    async with rollup_write():
+        transaction = await db.transactions.find_one_and_update(
+            {"_id": object_id},
+            [STASH_PREVIOUS_STAGE, *set_with_metrics_pipeline(update_data)],
+            return_document=ReturnDocument.AFTER
+        )
+        if not transaction:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+        previous = transaction.pop('_previous')
+        await update_rollups(added=[transaction], removed=[previous])
+    _invalidate_daily_cache()
     
-    return updated_transaction
+    return SalesTransaction(**transaction)
+
+@api_router.post("/transactions/bulk-delete")
+async def delete_transactions_bulk(input: BulkDeleteRequest):
+    object_ids = [ObjectId(transaction_id) for transaction_id in input.ids if ObjectId.is_valid(transaction_id)]
+    
+    # Delete each document atomically so only rows this call removed leave the rollups;
+    # ids already gone (or deleted concurrently) come back as None
+    async with rollup_write():
+        deleted = await asyncio.gather(*(
+            db.transactions.find_one_and_delete({"_id": object_id}, projection=TRANSACTION_PROJECTION) for object_id in set(object_ids)
+        ))
+        transactions = [transaction for transaction in deleted if transaction]
+        await update_rollups(removed=transactions)
+    _invalidate_daily_cache()
+    return {"message": "Transactions deleted successfully", "deleted_count": len(transactions)}
 
 @api_router.delete("/transactions/{transaction_id}")
 async def delete_transaction(transaction_id: str):
-    result = await db.transactions.delete_one({"id": transaction_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Transaction not found")
+    object_id = parse_object_id(transaction_id, "Transaction not found")
+    async with rollup_write():
+        transaction = await db.transactions.find_one_and_delete({"_id": object_id}, projection=TRANSACTION_PROJECTION)
+        if not transaction:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+        await update_rollups(removed=[transaction])
+    _invalidate_daily_cache()
     return {"message": "Transaction deleted successfully"}
 
 # Inventory Endpoints
 @api_router.post("/inventory", response_model=InventoryItem)
 async def create_inventory_item(input: InventoryItemCreate):
     item_dict = input.dict()
-    item_obj = InventoryItem(**item_dict)
+    item_id = ObjectId()
+    item_obj = InventoryItem(id=item_id, **item_dict)
     
     # Insert into database
-    result = await db.inventory.insert_one(item_obj.dict())
+    await db.inventory.insert_one({"_id": item_id, **item_obj.dict(exclude={'id'})})
     
     return item_obj
 
 @api_router.get("/inventory", response_model=List[InventoryItem])
 async def get_inventory():
     items = await db.inventory.find().sort("item_name", 1).to_list(1000)
-    return [InventoryItem(**item) for item in items]
+    # Stored documents are trusted, so skip model validation and serialize them directly
+    return ORJSONResponse([with_string_id(item) for item in items])
 
 @api_router.get("/inventory/{item_id}", response_model=InventoryItem)
 async def get_inventory_item(item_id: str):
-    item = await db.inventory.find_one({"id": item_id})
+    object_id = parse_object_id(item_id, "Inventory item not found")
+    item = await db.inventory.find_one({"_id": object_id})
     if not item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     return InventoryItem(**item)
 
 @api_router.put("/inventory/{item_id}", response_model=InventoryItem)
 async def update_inventory_item(item_id: str, input: InventoryItemUpdate):
-    existing_item = await db.inventory.find_one({"id": item_id})
+    object_id = parse_object_id(item_id, "Inventory item not found")
+    existing_item = await db.inventory.find_one({"_id": object_id})
     if not existing_item:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     
@@ -278,155 +555,106 @@ async def update_inventory_item(item_id: str, input: InventoryItemUpdate):
     
     # Update in database
     await db.inventory.update_one(
-        {"id": item_id}, 
-        {"$set": updated_item.dict()}
+        {"_id": object_id}, 
+        {"$set": updated_item.dict(exclude={'id'})}
     )
     
     return updated_item
 
+@api_router.post("/inventory/bulk-delete")
+async def delete_inventory_bulk(input: BulkDeleteRequest):
+    object_ids = [ObjectId(item_id) for item_id in input.ids if ObjectId.is_valid(item_id)]
+    result = await db.inventory.delete_many({"_id": {"$in": object_ids}})
+    return {"message": "Inventory items deleted successfully", "deleted_count": result.deleted_count}
+
 @api_router.delete("/inventory/{item_id}")
 async def delete_inventory_item(item_id: str):
-    result = await db.inventory.delete_one({"id": item_id})
+    object_id = parse_object_id(item_id, "Inventory item not found")
+    result = await db.inventory.delete_one({"_id": object_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Inventory item not found")
     return {"message": "Inventory item deleted successfully"}
 
 @api_router.get("/inventory-stats", response_model=InventoryStats)
 async def get_inventory_stats():
-    items = await db.inventory.find().to_list(1000)
-    
-    if not items:
-        return InventoryStats(
-            total_items=0,
-            total_stock_value=0.0,
-            low_stock_items=0,
-            out_of_stock_items=0,
-            categories=[]
-        )
-    
-    total_items = len(items)
-    total_stock_value = sum(item['purchase_cost'] * item['quantity_in_stock'] for item in items)
-    low_stock_items = sum(1 for item in items if item['quantity_in_stock'] <= item['reorder_level'] and item['quantity_in_stock'] > 0)
-    out_of_stock_items = sum(1 for item in items if item['quantity_in_stock'] == 0)
+    # Reduce the inventory server-side instead of shipping every item
+    pipeline = [
+        {"$group": {
+            "_id": None,
+            "total_items": {"$sum": 1},
+            "total_stock_value": {"$sum": {"$multiply": ["$purchase_cost", "$quantity_in_stock"]}},
+            "low_stock_items": {"$sum": {"$cond": [
+                {"$and": [
+                    {"$lte": ["$quantity_in_stock", "$reorder_level"]},
+                    {"$gt": ["$quantity_in_stock", 0]}
+                ]},
+                1,
+                0
+            ]}},
+            "out_of_stock_items": {"$sum": {"$cond": [{"$eq": ["$quantity_in_stock", 0]}, 1, 0]}},
+            "categories": {"$addToSet": {"$ifNull": ["$category", "Uncategorized"]}}
+        }}
+    ]
     
-    categories = list(set(item.get('category', 'Uncategorized') for item in items))
+    async for stats in db.inventory.aggregate(pipeline):
+        return InventoryStats(**stats)
     
     return InventoryStats(
-        total_items=total_items,
-        total_stock_value=total_stock_value,
-        low_stock_items=low_stock_items,
-        out_of_stock_items=out_of_stock_items,
-        categories=categories
+        total_items=0,
+        total_stock_value=0.0,
+        low_stock_items=0,
+        out_of_stock_items=0,
+        categories=[]
     )
 
 @api_router.get("/dashboard", response_model=DashboardStats)
 async def get_dashboard_stats():
-    # Get all transactions
-    transactions = await db.transactions.find().to_list(1000)
-    
-    if not transactions:
-        return DashboardStats(
-            total_revenue=0.0,
-            total_profit=0.0,
-            total_transactions=0,
-            average_profit_margin=0.0,
-            best_selling_item=None,
-            daily_sales=[]
-        )
-    
-    # Calculate totals
-    total_revenue = sum(t['revenue'] for t in transactions)
-    total_profit = sum(t['profit'] for t in transactions)
-    total_transactions = len(transactions)
-    
-    # Calculate average profit margin
-    profit_margins = [t['profit_margin'] for t in transactions if t['profit_margin'] > 0]
-    average_profit_margin = sum(profit_margins) / len(profit_margins) if profit_margins else 0
-    
-    # Find best selling item (by quantity)
-    item_sales = {}
-    for t in transactions:
-        item_name = t['item_name']
-        if item_name in item_sales:
-            item_sales[item_name] += t['quantity']
-        else:
-            item_sales[item_name] = t['quantity']
-    
-    best_selling_item = max(item_sales, key=item_sales.get) if item_sales else None
+    # Every figure comes from a rollup, so no query scans transactions; they run concurrently
+    totals, best_seller, daily = await asyncio.gather(
+        db.sales_totals.find_one({"_id": SALES_TOTALS_ID}),
+        db.item_totals.find({"qty": {"$gt": 0}}).sort("qty", -1).limit(1).to_list(1),
+        _aggregate_daily()
+    )
     
-    # Calculate daily sales for the last 7 days
-    from collections import defaultdict
-    daily_sales = defaultdict(lambda: {'revenue': 0, 'profit': 0, 'transactions': 0})
+    # The stats are built from trusted rollup documents, so they are returned as a
+    # plain dict and skip DashboardStats validation; response_model only documents the shape
+    if not totals or totals['transactions'] <= 0:
+        return ORJSONResponse({
+            'total_revenue': 0.0,
+            'total_profit': 0.0,
+            'total_transactions': 0,
+            'average_profit_margin': 0.0,
+            'best_selling_item': None,
+            'daily_sales': []
+        })
     
-    for t in transactions:
-        # Handle date conversion
-        if isinstance(t['date_sold'], str):
-            transaction_date = datetime.fromisoformat(t['date_sold']).date()
-        else:
-            transaction_date = t['date_sold']
-        
-        date_str = transaction_date.isoformat()
-        daily_sales[date_str]['revenue'] += t['revenue']
-        daily_sales[date_str]['profit'] += t['profit']
-        daily_sales[date_str]['transactions'] += 1
-    
-    # Convert to list format
     daily_sales_list = [
         {
-            'date': date_str,
-            'revenue': stats['revenue'],
-            'profit': stats['profit'],
-            'transactions': stats['transactions']
+            'date': day['_id'],
+            'revenue': day['revenue'],
+            'profit': day['profit'],
+            'transactions': day['transactions']
         }
-        for date_str, stats in sorted(daily_sales.items())
+        for day in daily[-7:]  # last 7 days with sales
     ]
     
-    return DashboardStats(
-        total_revenue=total_revenue,
-        total_profit=total_profit,
-        total_transactions=total_transactions,
-        average_profit_margin=average_profit_margin,
-        best_selling_item=best_selling_item,
-        daily_sales=daily_sales_list
-    )
+    return ORJSONResponse({
+        'total_revenue': totals['revenue'],
+        'total_profit': totals['profit'],
+        'total_transactions': totals['transactions'],
+        'average_profit_margin': totals['margin_sum'] / totals['margin_count'] if totals['margin_count'] > 0 else 0.0,
+        'best_selling_item': best_seller[0]['_id'] if best_seller else None,
+        'daily_sales': daily_sales_list
+    })
 
 @api_router.get("/sales-chart", response_model=SalesChart)
 async def get_sales_chart():
-    # Get all transactions
-    transactions = await db.transactions.find().to_list(1000)
-    
-    if not transactions:
-        return SalesChart(
-            labels=[],
-            revenue_data=[],
-            profit_data=[]
-        )
-    
-    # Group by date
-    from collections import defaultdict
-    daily_data = defaultdict(lambda: {'revenue': 0, 'profit': 0})
-    
-    for t in transactions:
-        # Handle date conversion
-        if isinstance(t['date_sold'], str):
-            transaction_date = datetime.fromisoformat(t['date_sold']).date()
-        else:
-            transaction_date = t['date_sold']
-        
-        date_str = transaction_date.isoformat()
-        daily_data[date_str]['revenue'] += t['revenue']
-        daily_data[date_str]['profit'] += t['profit']
-    
-    # Sort by date and prepare for chart
-    sorted_dates = sorted(daily_data.keys())
-    labels = sorted_dates
-    revenue_data = [daily_data[date]['revenue'] for date in sorted_dates]
-    profit_data = [daily_data[date]['profit'] for date in sorted_dates]
+    daily = await _aggregate_daily()
     
     return SalesChart(
-        labels=labels,
-        revenue_data=revenue_data,
-        profit_data=profit_data
+        labels=[day['_id'] for day in daily],
+        revenue_data=[day['revenue'] for day in daily],
+        profit_data=[day['profit'] for day in daily]
     )
 
 # Include the router in the main app
@@ -447,6 +675,44 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def warm_up_db_client():
+    # Open the first pooled connection before serving traffic
+    await db.command("ping")
+
+@app.on_event("startup")
+async def migrate_object_ids():
+    # Documents are keyed by _id now; drop the legacy uuid field
+    for collection in (db.transactions, db.inventory):
+        await collection.update_many({"id": {"$exists": True}}, {"$unset": {"id": ""}})
+
+@app.on_event("startup")
+async def ensure_indexes():
+    # create_index is a no-op when the index already exists. GET /transactions pages
+    # on _id, so created_at is deliberately left unindexed
+    await db.transactions.create_index("date_sold")
+    await db.inventory.create_index("item_name")
+    await db.inventory.create_index("category")
+    await db.item_totals.create_index([("qty", -1)])
+
+@app.on_event("startup")
+async def migrate_date_sold():
+    # One-shot conversion of legacy ISO-string dates to BSON dates
+    await db.transactions.update_many(
+        {"date_sold": {"$type": "string"}},
+        [{"$set": {"date_sold": {"$dateFromString": {"dateString": "$date_sold"}}}}]
+    )
+
+@app.on_event("startup")
+async def build_rollups_if_missing():
+    # The rollups are maintained incrementally, so they are only built from scratch on
+    # first start. Rebuilding in every worker would let one that is still starting
+    # overwrite increments from workers already serving; resync with
+    # POST /transactions/recompute during maintenance instead
+    if await db.sales_totals.find_one({"_id": SALES_TOTALS_ID}) is None:
+        async with rollup_rebuild():
+            await rebuild_rollups()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
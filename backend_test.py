@@ -1,459 +1,800 @@
 import requests
-import json
-import unittest
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import pytest
+import logging
+import math
+import socket
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 # Use the public endpoint from frontend .env
 BASE_URL = "https://96d8f304-97eb-4f5e-9f00-bb49f289a82e.preview.emergentagent.com/api"
 
-class SalesTrackingAPITest(unittest.TestCase):
-    def setUp(self):
-        # Store IDs for cleanup
+# Progress messages are debug-level; run pytest with --log-cli-level=DEBUG to see them
+log = logging.getLogger("backend_test")
+
+# Endpoint URLs are fixed, so build them once
+HEALTH_URL = BASE_URL + "/"
+TX_URL = BASE_URL + "/transactions"
+TX_BULK_URL = TX_URL + "/bulk"
+TX_RECOMPUTE_URL = TX_URL + "/recompute"
+INV_URL = BASE_URL + "/inventory"
+DASH_URL = BASE_URL + "/dashboard"
+INV_STATS_URL = BASE_URL + "/inventory-stats"
+CHART_URL = BASE_URL + "/sales-chart"
+
+# Test case from requirements: iPhone Case, $5.00 cost, $15.00 retail, 1 quantity.
+# The payload never changes, so it is built and JSON-encoded once.
+_TODAY_ISO = date.today().isoformat()
+IPHONE_TX = {
+    "item_name": "iPhone Case",
+    "purchase_cost": 5.00,
+    "retail_price": 15.00,
+    "quantity": 1,
+    "date_sold": _TODAY_ISO
+}
+_IPHONE_TX_BYTES = orjson.dumps(IPHONE_TX)
+_EXPECTED_MARGIN = round((10.0 / 15.0) * 100, 7)  # $10 profit on $15 retail
+
+# Resolve the API host once at import so the shared Session never repeats getaddrinfo
+_BASE_HOST = urlsplit(BASE_URL).hostname
+
+def _resolve_once(host):
+    """Return an IPv4 address for host, or None to leave resolution to urllib3"""
+    try:
+        return socket.getaddrinfo(host, 443, socket.AF_INET, socket.SOCK_STREAM)[0][4][0]
+    except OSError:
+        return None
+
+_BASE_IP = _resolve_once(_BASE_HOST)
+
+class PinnedHostAdapter(HTTPAdapter):
+    """Connect to the pre-resolved IP while keeping the Host header, SNI and certificate checks on the hostname"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        if _BASE_IP:
+            kwargs["server_hostname"] = _BASE_HOST
+            kwargs["assert_hostname"] = _BASE_HOST
+        super().init_poolmanager(*args, **kwargs)
+    
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if _BASE_IP and parts.hostname == _BASE_HOST:
+            request.headers["Host"] = parts.netloc
+            request.url = parts._replace(netloc=parts.netloc.replace(_BASE_HOST, _BASE_IP, 1)).geturl()
+        return super().send(request, **kwargs)
+
+def _json(response):
+    """Decode a response body with orjson instead of the stdlib json module"""
+    return orjson.loads(response.content)
+
+class CreatedRecords:
+    """IDs of transactions and inventory items created against the live API"""
+    
+    def __init__(self):
         self.transaction_ids = []
         self.inventory_ids = []
+
+def _gather(executor, *calls):
+    """Run independent request callables concurrently and return their results in order"""
+    futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+def _bulk_delete(session, executor, url, ids):
+    """Delete records in one batched request, falling back to per-ID deletes"""
+    if not ids:
+        return
+    try:
+        response = session.post(url + "/bulk-delete", data=orjson.dumps({"ids": ids}))
+        if response.status_code in (404, 405):
+            # Server doesn't expose the batch endpoint yet. Older routers match the
+            # path as /{id} (GET/PUT/DELETE only) and answer 405 rather than 404.
+            # The deletes are independent, so overlap their round trips
+            list(executor.map(
+                lambda record_id: session.delete(f"{url}/{record_id}"),
+                ids
+            ))
+    except requests.RequestException:
+        pass
+
+@pytest.fixture(scope="session")
+def session():
+    # Share one keep-alive connection pool across the whole run. Request bodies are
+    # pre-encoded, so JSON is the default content type; redirects and retries
+    # are disabled so an unexpected response fails fast instead of hiding latency.
+    http = requests.Session()
+    http.headers.update({
+        "Accept-Encoding": "gzip",
+        "Connection": "keep-alive",
+        "Content-Type": "application/json"
+    })
+    http.max_redirects = 0
+    http.mount("https://", PinnedHostAdapter(pool_connections=1, pool_maxsize=16, max_retries=Retry(total=0)))
+    yield http
+    http.close()
+
+@pytest.fixture(scope="session")
+def executor():
+    # Worker threads for fanning out independent requests
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        yield pool
+
+@pytest.fixture(scope="session")
+def created_records(session, executor):
+    """Everything the run created, removed with one bulk delete per collection at the end"""
+    records = CreatedRecords()
+    yield records
+    _gather(
+        executor,
+        lambda: _bulk_delete(session, executor, TX_URL, records.transaction_ids),
+        lambda: _bulk_delete(session, executor, INV_URL, records.inventory_ids)
+    )
+
+@pytest.fixture
+def cleanup(created_records):
+    """Collect the IDs a test creates and hand them to the end-of-session bulk delete"""
+    created = CreatedRecords()
+    yield created
+    created_records.transaction_ids.extend(created.transaction_ids)
+    created_records.inventory_ids.extend(created.inventory_ids)
+
+@pytest.fixture(scope="session")
+def seed_tx(session, created_records):
+    """One sample transaction shared by the read-only tests"""
+    response = session.post(TX_URL, data=_IPHONE_TX_BYTES)
+    assert response.status_code == 200
+    transaction = _json(response)
+    created_records.transaction_ids.append(transaction["id"])
+    return transaction
+
+def test_01_health_check(session):
+    """Test the API health check endpoint"""
+    log.debug("🔍 Testing API health check...")
+    response = session.get(HEALTH_URL)
+    assert response.status_code == 200
+    data = _json(response)
+    assert data["message"] == "Sales Tracking System API"
+    log.debug("✅ API health check passed")
+
+def _create_sample_transaction(session, cleanup):
+    """Create the sample transaction, check its calculated fields and return its ID"""
+    log.debug("🔍 Testing transaction creation...")
+    
+    response = session.post(TX_URL, data=_IPHONE_TX_BYTES)
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert data["item_name"] == "iPhone Case"
+    assert data["purchase_cost"] == 5.00
+    assert data["retail_price"] == 15.00
+    assert data["quantity"] == 1
+    
+    # Verify calculated fields
+    assert data["profit"] == 10.00
+    assert data["revenue"] == 15.00
+    assert math.isclose(data["profit_margin"], _EXPECTED_MARGIN, rel_tol=1e-6)
+    
+    # Save ID for cleanup
+    cleanup.transaction_ids.append(data["id"])
+    log.debug(f"✅ Transaction created successfully with ID: {data['id']}")
+    return data["id"]
+
+def test_02_create_transaction(session, cleanup):
+    """Test creating a new transaction"""
+    _create_sample_transaction(session, cleanup)
+
+def test_03_get_transactions(session, seed_tx):
+    """Test retrieving all transactions"""
+    log.debug("🔍 Testing transaction retrieval...")
+    
+    # Use the shared seed transaction
+    transaction_id = seed_tx["id"]
+    
+    # Get all transactions
+    response = session.get(TX_URL)
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert isinstance(data["items"], list)
+    
+    # Check if our transaction is in the first page (newest first)
+    assert transaction_id in {transaction["id"] for transaction in data["items"]}, "Created transaction not found in transactions list"
+    log.debug("✅ Transaction retrieval successful")
+
+def test_04_get_transaction_by_id(session, seed_tx):
+    """Test retrieving a specific transaction by ID"""
+    log.debug("🔍 Testing transaction retrieval by ID...")
+    
+    # Use the shared seed transaction
+    transaction_id = seed_tx["id"]
+    
+    # Get the specific transaction
+    response = session.get(f"{TX_URL}/{transaction_id}")
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert data["id"] == transaction_id
+    assert data["item_name"] == "iPhone Case"
+    log.debug("✅ Transaction retrieval by ID successful")
+
+def test_05_delete_transaction(session, cleanup):
+    """Test deleting a transaction"""
+    log.debug("🔍 Testing transaction deletion...")
+    
+    # Create a transaction first
+    transaction_id = _create_sample_transaction(session, cleanup)
+    
+    # Delete the transaction
+    response = session.delete(f"{TX_URL}/{transaction_id}")
+    assert response.status_code == 200
+    
+    # Verify it's deleted
+    response = session.get(f"{TX_URL}/{transaction_id}")
+    assert response.status_code == 404
+    
+    # Remove from cleanup list since we already deleted it
+    cleanup.transaction_ids.remove(transaction_id)
+    log.debug("✅ Transaction deletion successful")
+
+def test_06_dashboard_stats(session, seed_tx):
+    """Test dashboard statistics"""
+    log.debug("🔍 Testing dashboard statistics...")
+    
+    # Get dashboard stats
+    response = session.get(DASH_URL)
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert "total_revenue" in data
+    assert "total_profit" in data
+    assert "total_transactions" in data
+    assert "average_profit_margin" in data
+    assert "daily_sales" in data
+    
+    # Verify stats are positive numbers
+    assert data["total_revenue"] > 0
+    assert data["total_profit"] > 0
+    assert data["total_transactions"] > 0
+    assert data["average_profit_margin"] > 0
+    log.debug("✅ Dashboard statistics retrieval successful")
+
+def test_07_edge_case_zero_profit(session, cleanup):
+    """Test transaction with zero profit"""
+    log.debug("🔍 Testing zero profit transaction...")
+    
+    transaction_data = {
+        "item_name": "Zero Profit Item",
+        "purchase_cost": 10.00,
+        "retail_price": 10.00,
+        "quantity": 1
+    }
+    
+    response = session.post(TX_URL, data=orjson.dumps(transaction_data))
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert data["profit"] == 0.00
+    assert data["profit_margin"] == 0.00
+    
+    # Save ID for cleanup
+    cleanup.transaction_ids.append(data["id"])
+    log.debug("✅ Zero profit transaction test passed")
+
+def test_08_edge_case_multiple_quantity(session, cleanup):
+    """Test transaction with multiple quantity"""
+    log.debug("🔍 Testing multiple quantity transaction...")
+    
+    transaction_data = {
+        "item_name": "Bulk Item",
+        "purchase_cost": 5.00,
+        "retail_price": 10.00,
+        "quantity": 5
+    }
+    
+    response = session.post(TX_URL, data=orjson.dumps(transaction_data))
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert data["profit"] == 25.00  # (10-5) * 5
+    assert data["revenue"] == 50.00  # 10 * 5
+    
+    # Save ID for cleanup
+    cleanup.transaction_ids.append(data["id"])
+    log.debug("✅ Multiple quantity transaction test passed")
+
+# Inventory Tests
+def _create_sample_inventory_item(session, cleanup):
+    """Create the sample inventory item, check its fields and return its ID"""
+    log.debug("🔍 Testing inventory item creation...")
+    
+    # Test case from requirements: iPhone Case, $5.00 cost, $15.00 retail, 10 stock
+    inventory_data = {
+        "item_name": "iPhone Case",
+        "purchase_cost": 5.00,
+        "suggested_retail_price": 15.00,
+        "quantity_in_stock": 10,
+        "reorder_level": 5,
+        "supplier": "Apple",
+        "category": "Phone Accessories"
+    }
+    
+    response = session.post(INV_URL, data=orjson.dumps(inventory_data))
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert data["item_name"] == "iPhone Case"
+    assert data["purchase_cost"] == 5.00
+    assert data["suggested_retail_price"] == 15.00
+    assert data["quantity_in_stock"] == 10
+    assert data["supplier"] == "Apple"
+    assert data["category"] == "Phone Accessories"
+    
+    # Save ID for cleanup
+    cleanup.inventory_ids.append(data["id"])
+    log.debug(f"✅ Inventory item created successfully with ID: {data['id']}")
+    return data["id"]
+
+def test_09_create_inventory_item(session, cleanup):
+    """Test creating a new inventory item"""
+    _create_sample_inventory_item(session, cleanup)
+
+def test_10_get_inventory_items(session, cleanup):
+    """Test retrieving all inventory items"""
+    log.debug("🔍 Testing inventory items retrieval...")
+    
+    # Create an inventory item first
+    inventory_id = _create_sample_inventory_item(session, cleanup)
+    
+    # Get all inventory items
+    response = session.get(INV_URL)
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert isinstance(data, list)
+    
+    # Check if our inventory item is in the list
+    assert inventory_id in {item["id"] for item in data}, "Created inventory item not found in inventory list"
+    log.debug("✅ Inventory items retrieval successful")
+
+def test_11_get_inventory_item_by_id(session, cleanup):
+    """Test retrieving a specific inventory item by ID"""
+    log.debug("🔍 Testing inventory item retrieval by ID...")
+    
+    # Create an inventory item first
+    inventory_id = _create_sample_inventory_item(session, cleanup)
+    
+    # Get the specific inventory item
+    response = session.get(f"{INV_URL}/{inventory_id}")
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert data["id"] == inventory_id
+    assert data["item_name"] == "iPhone Case"
+    log.debug("✅ Inventory item retrieval by ID successful")
+
+def test_12_update_inventory_item(session, cleanup):
+    """Test updating an inventory item"""
+    log.debug("🔍 Testing inventory item update...")
+    
+    # Create an inventory item first
+    inventory_id = _create_sample_inventory_item(session, cleanup)
+    
+    # Update the inventory item
+    update_data = {
+        "quantity_in_stock": 15,
+        "suggested_retail_price": 20.00
+    }
+    
+    response = session.put(f"{INV_URL}/{inventory_id}", data=orjson.dumps(update_data))
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert data["id"] == inventory_id
+    assert data["quantity_in_stock"] == 15
+    assert data["suggested_retail_price"] == 20.00
+    log.debug("✅ Inventory item update successful")
+
+def test_13_delete_inventory_item(session, cleanup):
+    """Test deleting an inventory item"""
+    log.debug("🔍 Testing inventory item deletion...")
+    
+    # Create an inventory item first
+    inventory_id = _create_sample_inventory_item(session, cleanup)
+    
+    # Delete the inventory item
+    response = session.delete(f"{INV_URL}/{inventory_id}")
+    assert response.status_code == 200
+    
+    # Verify it's deleted
+    response = session.get(f"{INV_URL}/{inventory_id}")
+    assert response.status_code == 404
+    
+    # Remove from cleanup list since we already deleted it
+    cleanup.inventory_ids.remove(inventory_id)
+    log.debug("✅ Inventory item deletion successful")
+
+def test_14_inventory_stats(session, cleanup):
+    """Test inventory statistics"""
+    log.debug("🔍 Testing inventory statistics...")
+    
+    # Create an inventory item first to ensure we have data
+    _create_sample_inventory_item(session, cleanup)
+    
+    # Get inventory stats
+    response = session.get(INV_STATS_URL)
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert "total_items" in data
+    assert "total_stock_value" in data
+    assert "low_stock_items" in data
+    assert "out_of_stock_items" in data
+    assert "categories" in data
+    
+    # Verify stats are valid
+    assert data["total_items"] >= 1
+    assert data["total_stock_value"] >= 50.00  # 5.00 * 10
+    assert isinstance(data["categories"], list)
+    assert "Phone Accessories" in data["categories"]
+    log.debug("✅ Inventory statistics retrieval successful")
+
+def test_15_sales_chart_data(session, seed_tx):
+    """Test sales chart data"""
+    log.debug("🔍 Testing sales chart data...")
+    
+    # Get sales chart data
+    response = session.get(CHART_URL)
+    assert response.status_code == 200
+    
+    data = _json(response)
+    assert "labels" in data
+    assert "revenue_data" in data
+    assert "profit_data" in data
+    
+    # Verify data structure
+    assert isinstance(data["labels"], list)
+    assert isinstance(data["revenue_data"], list)
+    assert isinstance(data["profit_data"], list)
+    
+    # Verify data length consistency
+    assert len(data["labels"]) == len(data["revenue_data"])
+    assert len(data["labels"]) == len(data["profit_data"])
+    log.debug("✅ Sales chart data retrieval successful")
+
+def test_16_inventory_integration_with_sales(session, cleanup):
+    """Test inventory integration with sales"""
+    log.debug("🔍 Testing inventory integration with sales...")
+    
+    # Create an inventory item
+    inventory_data = {
+        "item_name": "Integration Test Item",
+        "purchase_cost": 10.00,
+        "suggested_retail_price": 25.00,
+        "quantity_in_stock": 5,
+        "reorder_level": 2,
+        "category": "Test Category"
+    }
+    
+    response = session.post(INV_URL, data=orjson.dumps(inventory_data))
+    assert response.status_code == 200
+    inventory_item = _json(response)
+    cleanup.inventory_ids.append(inventory_item["id"])
+    
+    # Create a sale for this inventory item. This must not be sent concurrently
+    # with the inventory POST: the server decrements stock at sale time, so a
+    # sale that lands before the item exists is never applied to it.
+    transaction_data = {
+        "item_name": "Integration Test Item",
+        "purchase_cost": 10.00,
+        "retail_price": 25.00,
+        "quantity": 2
+    }
+    
+    response = session.post(TX_URL, data=orjson.dumps(transaction_data))
+    assert response.status_code == 200
+    transaction = _json(response)
+    cleanup.transaction_ids.append(transaction["id"])
+    
+    # Verify inventory quantity was reduced
+    response = session.get(f"{INV_URL}/{inventory_item['id']}")
+    assert response.status_code == 200
+    updated_inventory = _json(response)
+    
+    # Quantity should be reduced by the sale quantity
+    assert updated_inventory["quantity_in_stock"] == 3  # 5 - 2
+    log.debug("✅ Inventory integration with sales successful")
+
+def test_17_edge_case_out_of_stock(session, cleanup):
+    """Test out of stock inventory item"""
+    log.debug("🔍 Testing out of stock inventory item...")
+    
+    # Create an inventory item with zero stock
+    inventory_data = {
+        "item_name": "Out of Stock Item",
+        "purchase_cost": 15.00,
+        "suggested_retail_price": 30.00,
+        "quantity_in_stock": 0,
+        "reorder_level": 5
+    }
+    
+    response = session.post(INV_URL, data=orjson.dumps(inventory_data))
+    assert response.status_code == 200
+    inventory_item = _json(response)
+    cleanup.inventory_ids.append(inventory_item["id"])
+    
+    # Get inventory stats
+    response = session.get(INV_STATS_URL)
+    assert response.status_code == 200
+    stats = _json(response)
+    
+    # Verify out of stock count increased
+    assert stats["out_of_stock_items"] >= 1
+    log.debug("✅ Out of stock inventory test passed")
+
+def test_18_edge_case_low_stock(session, cleanup):
+    """Test low stock inventory item"""
+    log.debug("🔍 Testing low stock inventory item...")
+    
+    # Create an inventory item with stock at reorder level
+    inventory_data = {
+        "item_name": "Low Stock Item",
+        "purchase_cost": 20.00,
+        "suggested_retail_price": 40.00,
+        "quantity_in_stock": 3,
+        "reorder_level": 5
+    }
+    
+    response = session.post(INV_URL, data=orjson.dumps(inventory_data))
+    assert response.status_code == 200
+    inventory_item = _json(response)
+    cleanup.inventory_ids.append(inventory_item["id"])
+    
+    # Get inventory stats
+    response = session.get(INV_STATS_URL)
+    assert response.status_code == 200
+    stats = _json(response)
+    
+    # Verify low stock count increased
+    assert stats["low_stock_items"] >= 1
+    log.debug("✅ Low stock inventory test passed")
+
+def test_19_bulk_create_transactions(session, cleanup):
+    """Test creating several transactions in one request"""
+    log.debug("🔍 Testing bulk transaction creation...")
+    
+    # Create an inventory item that two of the sales draw from
+    inventory_data = {
+        "item_name": "Bulk Create Test Item",
+        "purchase_cost": 4.00,
+        "suggested_retail_price": 10.00,
+        "quantity_in_stock": 10,
+        "reorder_level": 2,
+        "category": "Test Category"
+    }
+    
+    response = session.post(INV_URL, data=orjson.dumps(inventory_data))
+    assert response.status_code == 200
+    inventory_item = _json(response)
+    cleanup.inventory_ids.append(inventory_item["id"])
+    
+    transactions_data = [
+        {"item_name": "Bulk Create Test Item", "purchase_cost": 4.00, "retail_price": 10.00, "quantity": 2},
+        {"item_name": "Bulk Create Other Item", "purchase_cost": 1.00, "retail_price": 3.00, "quantity": 1},
+        {"item_name": "Bulk Create Test Item", "purchase_cost": 4.00, "retail_price": 8.00, "quantity": 3}
+    ]
+    
+    response = session.post(TX_BULK_URL, data=orjson.dumps(transactions_data))
+    assert response.status_code == 200
+    
+    data = _json(response)
+    cleanup.transaction_ids.extend(transaction["id"] for transaction in data)
+    
+    # Rows come back in request order with server-computed metrics
+    assert [(t["item_name"], t["quantity"]) for t in data] == [(t["item_name"], t["quantity"]) for t in transactions_data]
+    assert [t["revenue"] for t in data] == [20.00, 3.00, 24.00]
+    assert [t["profit"] for t in data] == [12.00, 2.00, 12.00]
+    assert math.isclose(data[0]["profit_margin"], 60.0, rel_tol=1e-6)
+    assert len({t["id"] for t in data}) == 3
+    
+    # Stock drops once by the summed quantity of the item's sales
+    response = session.get(f"{INV_URL}/{inventory_item['id']}")
+    assert response.status_code == 200
+    assert _json(response)["quantity_in_stock"] == 5  # 10 - (2 + 3)
+    log.debug("✅ Bulk transaction creation successful")
+
+def _assert_all_close(actual, expected):
+    """Rollup sums may be accumulated in a different order, so compare floats loosely"""
+    assert len(actual) == len(expected)
+    for a, b in zip(actual, expected):
+        assert math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6), f"{a} != {b}"
+
+def _chart_day(chart, day):
+    """Return (revenue, profit) for a day in the sales chart, zeros if absent"""
+    if day in chart["labels"]:
+        index = chart["labels"].index(day)
+        return chart["revenue_data"][index], chart["profit_data"][index]
+    return 0.0, 0.0
+
+def test_20_recompute_keeps_totals(session, executor, cleanup):
+    """Test that recomputing metrics and rebuilding the rollups keeps a sale's totals"""
+    log.debug("🔍 Testing transaction metrics recompute...")
+    
+    # Other workers may write while this runs, so only a day this test owns is checked
+    sold_on = "1990-01-01"
+    transaction_data = {
+        "item_name": "Recompute Test Item",
+        "purchase_cost": 2.00,
+        "retail_price": 5.00,
+        "quantity": 4,
+        "date_sold": sold_on
+    }
+    response = session.post(TX_URL, data=orjson.dumps(transaction_data))
+    assert response.status_code == 200
+    transaction_id = _json(response)["id"]
+    cleanup.transaction_ids.append(transaction_id)
+    
+    _assert_all_close(_chart_day(_json(session.get(CHART_URL)), sold_on), [20.00, 12.00])
+    
+    response = session.post(TX_RECOMPUTE_URL)
+    assert response.status_code == 200
+    assert "modified_count" in _json(response)
+    
+    # The rebuilt rollup and the recomputed metrics agree with the incremental ones
+    chart, transaction = (_json(r) for r in _gather(
+        executor,
+        lambda: session.get(CHART_URL),
+        lambda: session.get(f"{TX_URL}/{transaction_id}")
+    ))
+    _assert_all_close(_chart_day(chart, sold_on), [20.00, 12.00])
+    _assert_all_close([transaction["revenue"], transaction["profit"], transaction["profit_margin"]], [20.00, 12.00, 60.0])
+    log.debug("✅ Transaction metrics recompute successful")
+
+def test_21_transactions_pagination(session, cleanup):
+    """Test keyset pagination of the transactions list"""
+    log.debug("🔍 Testing transaction pagination...")
+    
+    # Create three transactions; bulk ids are assigned back to back in one process, so
+    # no other document's id sorts between them
+    transactions_data = [
+        {"item_name": f"Pagination Item {n}", "purchase_cost": 1.00, "retail_price": 2.00, "quantity": 1}
+        for n in range(3)
+    ]
+    response = session.post(TX_BULK_URL, data=orjson.dumps(transactions_data))
+    assert response.status_code == 200
+    created_ids = [transaction["id"] for transaction in _json(response)]
+    cleanup.transaction_ids.extend(created_ids)
+    
+    # Start just past the newest created id so rows added concurrently can't intrude;
+    # a full page returns exactly limit items, newest first, and a cursor
+    start_cursor = format(int(created_ids[-1], 16) + 1, "024x")
+    response = session.get(TX_URL, params={"limit": 2, "cursor": start_cursor})
+    assert response.status_code == 200
+    first_page = _json(response)
+    assert [t["id"] for t in first_page["items"]] == created_ids[:0:-1]
+    assert first_page["next_cursor"] == created_ids[1]
+    
+    # Following the cursor continues strictly after the last item
+    response = session.get(TX_URL, params={"limit": 2, "cursor": first_page["next_cursor"]})
+    assert response.status_code == 200
+    second_page = _json(response)
+    assert second_page["items"][0]["id"] == created_ids[0]
+    
+    # A short page means there is nothing left to fetch
+    response = session.get(TX_URL, params={"cursor": "0" * 24})
+    assert response.status_code == 200
+    assert _json(response) == {"items": [], "next_cursor": None}
+    
+    # Malformed cursors and out-of-range limits are rejected
+    response = session.get(TX_URL, params={"cursor": "not-an-object-id"})
+    assert response.status_code == 400
+    response = session.get(TX_URL, params={"limit": 0})
+    assert response.status_code == 422
+    log.debug("✅ Transaction pagination successful")
+
+def _get_dashboard_and_chart(session, executor):
+    """Fetch /dashboard and /sales-chart concurrently"""
+    return [_json(r) for r in _gather(executor, lambda: session.get(DASH_URL), lambda: session.get(CHART_URL))]
+
+def test_22_rollups_follow_transaction_writes(session, executor, cleanup):
+    """Test that the rollups track a transaction through create, update and delete"""
+    log.debug("🔍 Testing rollups across transaction writes...")
+    
+    # Other workers may write while this runs, so only facts this test owns are
+    # asserted: nothing else is ever sold on these dates or under these names
+    sold_on, moved_to = "1990-01-02", "1990-01-03"
+    names = ("Rollup Test Item", "Rollup Test Item Renamed")
+    
+    # A very large quantity makes this the best seller while it exists
+    transaction_data = {
+        "item_name": names[0],
+        "purchase_cost": 1.00,
+        "retail_price": 3.00,
+        "quantity": 1_000_000,
+        "date_sold": sold_on
+    }
+    response = session.post(TX_URL, data=orjson.dumps(transaction_data))
+    assert response.status_code == 200
+    transaction_id = _json(response)["id"]
+    cleanup.transaction_ids.append(transaction_id)
+    
+    dashboard, chart = _get_dashboard_and_chart(session, executor)
+    _assert_all_close([*_chart_day(chart, sold_on), *_chart_day(chart, moved_to)], [3_000_000.0, 2_000_000.0, 0.0, 0.0])
+    assert dashboard["best_selling_item"] == names[0]
+    
+    # Moving the sale to another day and renaming it moves its totals with it
+    update_data = {"item_name": names[1], "quantity": 500_000, "date_sold": moved_to}
+    response = session.put(f"{TX_URL}/{transaction_id}", data=orjson.dumps(update_data))
+    assert response.status_code == 200
+    updated_transaction = _json(response)
+    assert updated_transaction["revenue"] == 1_500_000.0
+    assert "_previous" not in updated_transaction
+    
+    dashboard, chart = _get_dashboard_and_chart(session, executor)
+    _assert_all_close([*_chart_day(chart, sold_on), *_chart_day(chart, moved_to)], [0.0, 0.0, 1_500_000.0, 1_000_000.0])
+    assert dashboard["best_selling_item"] == names[1]
+    
+    # Deleting it takes everything back out
+    response = session.delete(f"{TX_URL}/{transaction_id}")
+    assert response.status_code == 200
+    cleanup.transaction_ids.remove(transaction_id)
+    
+    dashboard, chart = _get_dashboard_and_chart(session, executor)
+    _assert_all_close([*_chart_day(chart, sold_on), *_chart_day(chart, moved_to)], [0.0] * 4)
+    assert dashboard["best_selling_item"] not in names
+    log.debug("✅ Rollups track transaction writes")
+
+def _assert_bulk_deleted(session, url, ids):
+    """Bulk-delete ids (plus junk and a duplicate) and check only real rows were counted"""
+    response = session.post(url + "/bulk-delete", data=orjson.dumps({"ids": [*ids, ids[0], "not-an-object-id"]}))
+    assert response.status_code == 200
+    assert _json(response)["deleted_count"] == len(ids)
+    
+    for record_id in ids:
+        assert session.get(f"{url}/{record_id}").status_code == 404
+    
+    # A second call finds nothing left to delete
+    response = session.post(url + "/bulk-delete", data=orjson.dumps({"ids": ids}))
+    assert response.status_code == 200
+    assert _json(response)["deleted_count"] == 0
+
+def test_23_bulk_delete_endpoints(session, executor, cleanup):
+    """Test deleting transactions and inventory items in bulk"""
+    log.debug("🔍 Testing bulk delete endpoints...")
+    
+    transactions_data = [
+        {"item_name": f"Bulk Delete Item {n}", "purchase_cost": 1.00, "retail_price": 2.00, "quantity": 1}
+        for n in range(2)
+    ]
+    response = session.post(TX_BULK_URL, data=orjson.dumps(transactions_data))
+    assert response.status_code == 200
+    transaction_ids = [transaction["id"] for transaction in _json(response)]
+    cleanup.transaction_ids.extend(transaction_ids)
+    
+    # The two inventory items are independent, so create them concurrently
+    inventory_payloads = [
+        orjson.dumps({
+            "item_name": f"Bulk Delete Item {n}",
+            "purchase_cost": 1.00,
+            "suggested_retail_price": 2.00,
+            "quantity_in_stock": 1
+        })
+        for n in range(2)
+    ]
+    responses = _gather(executor, *(lambda body=body: session.post(INV_URL, data=body) for body in inventory_payloads))
+    assert [response.status_code for response in responses] == [200, 200]
+    inventory_ids = [_json(response)["id"] for response in responses]
+    cleanup.inventory_ids.extend(inventory_ids)
+    
+    _assert_bulk_deleted(session, TX_URL, transaction_ids)
+    _assert_bulk_deleted(session, INV_URL, inventory_ids)
     
-    def tearDown(self):
-        # Clean up any transactions created during tests
-        for transaction_id in self.transaction_ids:
-            try:
-                requests.delete(f"{BASE_URL}/transactions/{transaction_id}")
-            except:
-                pass
-                
-        # Clean up any inventory items created during tests
-        for inventory_id in self.inventory_ids:
-            try:
-                requests.delete(f"{BASE_URL}/inventory/{inventory_id}")
-            except:
-                pass
-    
-    def test_01_health_check(self):
-        """Test the API health check endpoint"""
-        print("\n🔍 Testing API health check...")
-        response = requests.get(f"{BASE_URL}/")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
-        self.assertEqual(data["message"], "Sales Tracking System API")
-        print("✅ API health check passed")
-    
-    def test_02_create_transaction(self):
-        """Test creating a new transaction"""
-        print("\n🔍 Testing transaction creation...")
-        
-        # Test case from requirements: iPhone Case, $5.00 cost, $15.00 retail, 1 quantity
-        transaction_data = {
-            "item_name": "iPhone Case",
-            "purchase_cost": 5.00,
-            "retail_price": 15.00,
-            "quantity": 1,
-            "date_sold": date.today().isoformat()
-        }
-        
-        response = requests.post(f"{BASE_URL}/transactions", json=transaction_data)
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertEqual(data["item_name"], "iPhone Case")
-        self.assertEqual(data["purchase_cost"], 5.00)
-        self.assertEqual(data["retail_price"], 15.00)
-        self.assertEqual(data["quantity"], 1)
-        
-        # Verify calculated fields
-        self.assertEqual(data["profit"], 10.00)
-        self.assertEqual(data["revenue"], 15.00)
-        self.assertAlmostEqual(data["profit_margin"], (10.00/15.00)*100)
-        
-        # Save ID for cleanup
-        self.transaction_ids.append(data["id"])
-        print(f"✅ Transaction created successfully with ID: {data['id']}")
-        return data["id"]
-    
-    def test_03_get_transactions(self):
-        """Test retrieving all transactions"""
-        print("\n🔍 Testing transaction retrieval...")
-        
-        # Create a transaction first
-        transaction_id = self.test_02_create_transaction()
-        
-        # Get all transactions
-        response = requests.get(f"{BASE_URL}/transactions")
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertIsInstance(data, list)
-        
-        # Check if our transaction is in the list
-        found = False
-        for transaction in data:
-            if transaction["id"] == transaction_id:
-                found = True
-                break
-        
-        self.assertTrue(found, "Created transaction not found in transactions list")
-        print("✅ Transaction retrieval successful")
-    
-    def test_04_get_transaction_by_id(self):
-        """Test retrieving a specific transaction by ID"""
-        print("\n🔍 Testing transaction retrieval by ID...")
-        
-        # Create a transaction first
-        transaction_id = self.test_02_create_transaction()
-        
-        # Get the specific transaction
-        response = requests.get(f"{BASE_URL}/transactions/{transaction_id}")
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertEqual(data["id"], transaction_id)
-        self.assertEqual(data["item_name"], "iPhone Case")
-        print("✅ Transaction retrieval by ID successful")
-    
-    def test_05_delete_transaction(self):
-        """Test deleting a transaction"""
-        print("\n🔍 Testing transaction deletion...")
-        
-        # Create a transaction first
-        transaction_id = self.test_02_create_transaction()
-        
-        # Delete the transaction
-        response = requests.delete(f"{BASE_URL}/transactions/{transaction_id}")
-        self.assertEqual(response.status_code, 200)
-        
-        # Verify it's deleted
-        response = requests.get(f"{BASE_URL}/transactions/{transaction_id}")
-        self.assertEqual(response.status_code, 404)
-        
-        # Remove from cleanup list since we already deleted it
-        self.transaction_ids.remove(transaction_id)
-        print("✅ Transaction deletion successful")
-    
-    def test_06_dashboard_stats(self):
-        """Test dashboard statistics"""
-        print("\n🔍 Testing dashboard statistics...")
-        
-        # Create a transaction first to ensure we have data
-        self.test_02_create_transaction()
-        
-        # Get dashboard stats
-        response = requests.get(f"{BASE_URL}/dashboard")
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertIn("total_revenue", data)
-        self.assertIn("total_profit", data)
-        self.assertIn("total_transactions", data)
-        self.assertIn("average_profit_margin", data)
-        self.assertIn("daily_sales", data)
-        
-        # Verify stats are positive numbers
-        self.assertGreater(data["total_revenue"], 0)
-        self.assertGreater(data["total_profit"], 0)
-        self.assertGreater(data["total_transactions"], 0)
-        self.assertGreater(data["average_profit_margin"], 0)
-        print("✅ Dashboard statistics retrieval successful")
-    
-    def test_07_edge_case_zero_profit(self):
-        """Test transaction with zero profit"""
-        print("\n🔍 Testing zero profit transaction...")
-        
-        transaction_data = {
-            "item_name": "Zero Profit Item",
-            "purchase_cost": 10.00,
-            "retail_price": 10.00,
-            "quantity": 1
-        }
-        
-        response = requests.post(f"{BASE_URL}/transactions", json=transaction_data)
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertEqual(data["profit"], 0.00)
-        self.assertEqual(data["profit_margin"], 0.00)
-        
-        # Save ID for cleanup
-        self.transaction_ids.append(data["id"])
-        print("✅ Zero profit transaction test passed")
-    
-    def test_08_edge_case_multiple_quantity(self):
-        """Test transaction with multiple quantity"""
-        print("\n🔍 Testing multiple quantity transaction...")
-        
-        transaction_data = {
-            "item_name": "Bulk Item",
-            "purchase_cost": 5.00,
-            "retail_price": 10.00,
-            "quantity": 5
-        }
-        
-        response = requests.post(f"{BASE_URL}/transactions", json=transaction_data)
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertEqual(data["profit"], 25.00)  # (10-5) * 5
-        self.assertEqual(data["revenue"], 50.00)  # 10 * 5
-        
-        # Save ID for cleanup
-        self.transaction_ids.append(data["id"])
-        print("✅ Multiple quantity transaction test passed")
-        
-    # Inventory Tests
-    def test_09_create_inventory_item(self):
-        """Test creating a new inventory item"""
-        print("\n🔍 Testing inventory item creation...")
-        
-        # Test case from requirements: iPhone Case, $5.00 cost, $15.00 retail, 10 stock
-        inventory_data = {
-            "item_name": "iPhone Case",
-            "purchase_cost": 5.00,
-            "suggested_retail_price": 15.00,
-            "quantity_in_stock": 10,
-            "reorder_level": 5,
-            "supplier": "Apple",
-            "category": "Phone Accessories"
-        }
-        
-        response = requests.post(f"{BASE_URL}/inventory", json=inventory_data)
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertEqual(data["item_name"], "iPhone Case")
-        self.assertEqual(data["purchase_cost"], 5.00)
-        self.assertEqual(data["suggested_retail_price"], 15.00)
-        self.assertEqual(data["quantity_in_stock"], 10)
-        self.assertEqual(data["supplier"], "Apple")
-        self.assertEqual(data["category"], "Phone Accessories")
-        
-        # Save ID for cleanup
-        self.inventory_ids.append(data["id"])
-        print(f"✅ Inventory item created successfully with ID: {data['id']}")
-        return data["id"]
-    
-    def test_10_get_inventory_items(self):
-        """Test retrieving all inventory items"""
-        print("\n🔍 Testing inventory items retrieval...")
-        
-        # Create an inventory item first
-        inventory_id = self.test_09_create_inventory_item()
-        
-        # Get all inventory items
-        response = requests.get(f"{BASE_URL}/inventory")
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertIsInstance(data, list)
-        
-        # Check if our inventory item is in the list
-        found = False
-        for item in data:
-            if item["id"] == inventory_id:
-                found = True
-                break
-        
-        self.assertTrue(found, "Created inventory item not found in inventory list")
-        print("✅ Inventory items retrieval successful")
-    
-    def test_11_get_inventory_item_by_id(self):
-        """Test retrieving a specific inventory item by ID"""
-        print("\n🔍 Testing inventory item retrieval by ID...")
-        
-        # Create an inventory item first
-        inventory_id = self.test_09_create_inventory_item()
-        
-        # Get the specific inventory item
-        response = requests.get(f"{BASE_URL}/inventory/{inventory_id}")
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertEqual(data["id"], inventory_id)
-        self.assertEqual(data["item_name"], "iPhone Case")
-        print("✅ Inventory item retrieval by ID successful")
-    
-    def test_12_update_inventory_item(self):
-        """Test updating an inventory item"""
-        print("\n🔍 Testing inventory item update...")
-        
-        # Create an inventory item first
-        inventory_id = self.test_09_create_inventory_item()
-        
-        # Update the inventory item
-        update_data = {
-            "quantity_in_stock": 15,
-            "suggested_retail_price": 20.00
-        }
-        
-        response = requests.put(f"{BASE_URL}/inventory/{inventory_id}", json=update_data)
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertEqual(data["id"], inventory_id)
-        self.assertEqual(data["quantity_in_stock"], 15)
-        self.assertEqual(data["suggested_retail_price"], 20.00)
-        print("✅ Inventory item update successful")
-    
-    def test_13_delete_inventory_item(self):
-        """Test deleting an inventory item"""
-        print("\n🔍 Testing inventory item deletion...")
-        
-        # Create an inventory item first
-        inventory_id = self.test_09_create_inventory_item()
-        
-        # Delete the inventory item
-        response = requests.delete(f"{BASE_URL}/inventory/{inventory_id}")
-        self.assertEqual(response.status_code, 200)
-        
-        # Verify it's deleted
-        response = requests.get(f"{BASE_URL}/inventory/{inventory_id}")
-        self.assertEqual(response.status_code, 404)
-        
-        # Remove from cleanup list since we already deleted it
-        self.inventory_ids.remove(inventory_id)
-        print("✅ Inventory item deletion successful")
-    
-    def test_14_inventory_stats(self):
-        """Test inventory statistics"""
-        print("\n🔍 Testing inventory statistics...")
-        
-        # Create an inventory item first to ensure we have data
-        self.test_09_create_inventory_item()
-        
-        # Get inventory stats
-        response = requests.get(f"{BASE_URL}/inventory-stats")
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertIn("total_items", data)
-        self.assertIn("total_stock_value", data)
-        self.assertIn("low_stock_items", data)
-        self.assertIn("out_of_stock_items", data)
-        self.assertIn("categories", data)
-        
-        # Verify stats are valid
-        self.assertGreaterEqual(data["total_items"], 1)
-        self.assertGreaterEqual(data["total_stock_value"], 50.00)  # 5.00 * 10
-        self.assertIsInstance(data["categories"], list)
-        self.assertIn("Phone Accessories", data["categories"])
-        print("✅ Inventory statistics retrieval successful")
-    
-    def test_15_sales_chart_data(self):
-        """Test sales chart data"""
-        print("\n🔍 Testing sales chart data...")
-        
-        # Create a transaction first to ensure we have data
-        self.test_02_create_transaction()
-        
-        # Get sales chart data
-        response = requests.get(f"{BASE_URL}/sales-chart")
-        self.assertEqual(response.status_code, 200)
-        
-        data = response.json()
-        self.assertIn("labels", data)
-        self.assertIn("revenue_data", data)
-        self.assertIn("profit_data", data)
-        
-        # Verify data structure
-        self.assertIsInstance(data["labels"], list)
-        self.assertIsInstance(data["revenue_data"], list)
-        self.assertIsInstance(data["profit_data"], list)
-        
-        # Verify data length consistency
-        self.assertEqual(len(data["labels"]), len(data["revenue_data"]))
-        self.assertEqual(len(data["labels"]), len(data["profit_data"]))
-        print("✅ Sales chart data retrieval successful")
-    
-    def test_16_inventory_integration_with_sales(self):
-        """Test inventory integration with sales"""
-        print("\n🔍 Testing inventory integration with sales...")
-        
-        # Create an inventory item
-        inventory_data = {
-            "item_name": "Integration Test Item",
-            "purchase_cost": 10.00,
-            "suggested_retail_price": 25.00,
-            "quantity_in_stock": 5,
-            "reorder_level": 2,
-            "category": "Test Category"
-        }
-        
-        response = requests.post(f"{BASE_URL}/inventory", json=inventory_data)
-        self.assertEqual(response.status_code, 200)
-        inventory_item = response.json()
-        self.inventory_ids.append(inventory_item["id"])
-        
-        # Create a sale for this inventory item
-        transaction_data = {
-            "item_name": "Integration Test Item",
-            "purchase_cost": 10.00,
-            "retail_price": 25.00,
-            "quantity": 2
-        }
-        
-        response = requests.post(f"{BASE_URL}/transactions", json=transaction_data)
-        self.assertEqual(response.status_code, 200)
-        transaction = response.json()
-        self.transaction_ids.append(transaction["id"])
-        
-        # Verify inventory quantity was reduced
-        response = requests.get(f"{BASE_URL}/inventory/{inventory_item['id']}")
-        self.assertEqual(response.status_code, 200)
-        updated_inventory = response.json()
-        
-        # Quantity should be reduced by the sale quantity
-        self.assertEqual(updated_inventory["quantity_in_stock"], 3)  # 5 - 2
-        print("✅ Inventory integration with sales successful")
-    
-    def test_17_edge_case_out_of_stock(self):
-        """Test out of stock inventory item"""
-        print("\n🔍 Testing out of stock inventory item...")
-        
-        # Create an inventory item with zero stock
-        inventory_data = {
-            "item_name": "Out of Stock Item",
-            "purchase_cost": 15.00,
-            "suggested_retail_price": 30.00,
-            "quantity_in_stock": 0,
-            "reorder_level": 5
-        }
-        
-        response = requests.post(f"{BASE_URL}/inventory", json=inventory_data)
-        self.assertEqual(response.status_code, 200)
-        inventory_item = response.json()
-        self.inventory_ids.append(inventory_item["id"])
-        
-        # Get inventory stats
-        response = requests.get(f"{BASE_URL}/inventory-stats")
-        self.assertEqual(response.status_code, 200)
-        stats = response.json()
-        
-        # Verify out of stock count increased
-        self.assertGreaterEqual(stats["out_of_stock_items"], 1)
-        print("✅ Out of stock inventory test passed")
-    
-    def test_18_edge_case_low_stock(self):
-        """Test low stock inventory item"""
-        print("\n🔍 Testing low stock inventory item...")
-        
-        # Create an inventory item with stock at reorder level
-        inventory_data = {
-            "item_name": "Low Stock Item",
-            "purchase_cost": 20.00,
-            "suggested_retail_price": 40.00,
-            "quantity_in_stock": 3,
-            "reorder_level": 5
-        }
-        
-        response = requests.post(f"{BASE_URL}/inventory", json=inventory_data)
-        self.assertEqual(response.status_code, 200)
-        inventory_item = response.json()
-        self.inventory_ids.append(inventory_item["id"])
-        
-        # Get inventory stats
-        response = requests.get(f"{BASE_URL}/inventory-stats")
-        self.assertEqual(response.status_code, 200)
-        stats = response.json()
-        
-        # Verify low stock count increased
-        self.assertGreaterEqual(stats["low_stock_items"], 1)
-        print("✅ Low stock inventory test passed")
+    # Both sets are gone, so nothing is left for the session cleanup
+    cleanup.transaction_ids.clear()
+    cleanup.inventory_ids.clear()
+    log.debug("✅ Bulk delete endpoints successful")
 
 if __name__ == "__main__":
-    unittest.main(argv=['first-arg-is-ignored'], exit=False)
\ No newline at end of file
+    pytest.main([__file__])
@@ -852,8 +852,17 @@ function App() {
 
   const fetchTransactions = async () => {
     try {
-      const response = await axios.get(`${API}/transactions`);
-      setTransactions(response.data);
+      // The endpoint is paginated; follow next_cursor so older sales aren't dropped
+      const allTransactions = [];
+      let cursor = null;
+      do {
+        const response = await axios.get(`${API}/transactions`, {
+          params: { limit: 1000, ...(cursor ? { cursor } : {}) }
+        });
+        allTransactions.push(...response.data.items);
+        cursor = response.data.next_cursor;
+      } while (cursor);
+      setTransactions(allTransactions);
     } catch (error) {
       console.error('Error fetching transactions:', error);
     }